@@ -8,6 +8,7 @@ Writes:
 Also mirrors those into docs/ for the GitHub Pages site.
 
 Notes
+- Parses with lxml directly (no BeautifulSoup); all lookups are precompiled XPath.
 - Parses the main table (Date / Teams / Location / Time/Results) as the source of truth.
 - Then enriches each game from the card markup to grab opponent logos + TV.
 - Stadium images are expected at docs/assets/stadiums/{stadium_slug}.jpg for the TV hero.
@@ -15,266 +16,440 @@ Notes
 
 from __future__ import annotations
 
+import csv
+import hashlib
 import json
+import os
 import re
 import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
-from scraper.utils import slugify, normalize_tv
+try:
+    import orjson  # optional, faster JSON encoder
+except ImportError:
+    orjson = None
+
+from scraper import utils
+from scraper.utils import has_class, normalize_tv, slugify, text_of
 
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "data"
 DOCS = ROOT / "docs"
 ASSETS_STADIUMS = ROOT / "assets" / "stadiums"
 
-for p in (DATA, DOCS, ASSETS_STADIUMS):
-    p.mkdir(parents=True, exist_ok=True)
-
 SCHEDULE_URL = "https://huskers.com/sports/football/schedule"
 
-# Optional alias mapping for venue names → desired slug
-ALIASES: dict[str, str] = {}
-aliases_csv = ASSETS_STADIUMS / "aliases.csv"
-if aliases_csv.exists():
-    for line in aliases_csv.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line or line.startswith("#") or "," not in line:
+# Validators (+ body hash) of the last fetched page, for conditional GETs
+SCHEDULE_CACHE = DATA / ".schedule_cache.json"
+
+# One keep-alive session; requests already negotiates gzip/deflate
+SESSION = requests.Session()
+SESSION.headers.update({"User-Agent": "husker-fb-schedule/1.0"})
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+))
+
+# Patterns used per row/card in parse_schedule (compiled once at import)
+# "[Weekday] Month D": weekday optional, month short or long form
+_date_re = re.compile(
+    r"(?:\b(mon|tue|wed|thu|fri|sat|sun)[a-z]*\s+)?"
+    r"\b(jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?"
+    r"|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\s+(\d{1,2})",
+    re.I,
+)
+_teams_re = re.compile(r"^(vs\.|at)\s*(.*)$", re.I | re.M)
+_loc_split_re = re.compile(r"\s{2,}|\|")
+_time_re = re.compile(
+    r"\b(?P<h>\d{1,2}):(?P<m>\d{2})\s*(?P<ap>[AP]M)(?:\s*(?P<tz>[A-Z]{2,3}T))?\b", re.I
+)
+_city_tail_re = re.compile(r",.*$")
+_tv_junk_re = re.compile(r"[^a-z0-9 ]+")
+
+_MONTH_MAP = {
+    "jan": 1, "january": 1, "feb": 2, "february": 2, "mar": 3, "march": 3,
+    "apr": 4, "april": 4, "may": 5, "jun": 6, "june": 6, "jul": 7, "july": 7,
+    "aug": 8, "august": 8, "sep": 9, "sept": 9, "september": 9,
+    "oct": 10, "october": 10, "nov": 11, "november": 11, "dec": 12, "december": 12
+}
+_WEEKDAYS = ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+_MONTH3_TO_INT = {"Jan":1,"Feb":2,"Mar":3,"Apr":4,"May":5,"Jun":6,"Jul":7,"Aug":8,"Sep":9,"Oct":10,"Nov":11,"Dec":12}
+
+
+def _lower(expr: str) -> str:
+    return f"translate({expr}, 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+
+
+# XPath queries for parse_schedule (compiled once at import)
+_xp_table = etree.XPath(
+    f"(//table[.//th[contains({_lower('.')}, 'date')] and .//th[contains({_lower('.')}, 'location')]])[1]"
+)
+_xp_tbody = etree.XPath("(.//tbody)[1]")
+_xp_rows = etree.XPath(".//tr")
+_xp_cells = etree.XPath(".//td | .//th")
+_xp_cards = etree.XPath(f"//div[{has_class('schedule-event-item-default')}]")
+_xp_outer = etree.XPath(f"//*[{has_class('schedule-event-item')}]")
+_xp_inner_cards = etree.XPath(f".//div[{has_class('schedule-event-item-default')}]")
+_xp_tv_img = etree.XPath(
+    f"(.//*[{has_class('schedule-event-bottom__list')}])[1]"
+    f"//a[{has_class('schedule-event-bottom__link')}]//img[@alt]"
+)
+
+
+def _first(xp, el):
+    found = xp(el)
+    return found[0] if found else None
+
+
+# Card sub-elements located by _card_parts (class name → key)
+_CARD_PARTS = {
+    "schedule-event-item-default__opponent-name": "opp",
+    "schedule-event-item-default__divider": "va",
+    "schedule-event-item-default__images": "imgs",
+    "schedule-event-location": "loc",
+}
+
+
+def _card_parts(card) -> tuple[dict, list, list]:
+    # Single walk over a card's subtree. Returns the first element per
+    # _CARD_PARTS key, the <img>s inside the __images block(s) and every img[alt].
+    found: dict = {}
+    open_blocks: list = []  # __images elements we are currently inside
+    logo_imgs: list = []
+    alt_imgs: list = []
+    for event, el in etree.iterwalk(card, events=("start", "end")):
+        if el is card or not isinstance(el.tag, str):  # the card itself, comments / PIs
             continue
-        src, slug = [x.strip() for x in line.split(",", 1)]
-        if src and slug:
-            ALIASES[src] = slug
-
-
-def get_html(url: str) -> str:
-    r = requests.get(url, timeout=30)
+        if event == "end":
+            if open_blocks and open_blocks[-1] is el:
+                open_blocks.pop()
+            continue
+        if el.tag == "img":
+            if el.get("alt") is not None:
+                alt_imgs.append(el)
+            if open_blocks:
+                logo_imgs.append(el)
+        is_block = False
+        for name in (el.get("class") or "").split():
+            key = _CARD_PARTS.get(name)
+            if key == "imgs":
+                is_block = True
+            elif key and key not in found:
+                found[key] = el
+        if is_block:
+            open_blocks.append(el)
+    return found, logo_imgs, alt_imgs
+
+
+def _first_from_srcset(s: str | None) -> str | None:
+    if not s:
+        return None
+    return s.split(",")[0].strip().split(" ")[0]
+
+
+def _img_url(img) -> str | None:
+    # First real URL in lazy-load priority order; stops at the first hit so
+    # later attributes (and srcset splitting) are only looked at when needed.
+    for attr in ("data-src", "data-srcset", "srcset", "src"):
+        u = img.get(attr)
+        if u and attr.endswith("srcset"):
+            u = _first_from_srcset(u)
+        if u and not u.startswith("data:image"):
+            return u
+    return None
+
+
+@lru_cache(maxsize=None)
+def load_aliases() -> dict[str, str]:
+    # Optional alias mapping for venue names → desired slug (read once, on first use)
+    # The slug is the last column; an unquoted venue containing commas
+    # ("Memorial Stadium (Lincoln, Neb.)") is rejoined from the rest.
+    aliases_csv = ASSETS_STADIUMS / "aliases.csv"
+    if not aliases_csv.exists():
+        return {}
+    with aliases_csv.open(encoding="utf-8", newline="") as f:
+        rows = [row for row in csv.reader(f)
+                if len(row) >= 2 and not row[0].lstrip().startswith("#")]
+    aliases = {",".join(row[:-1]).strip(): row[-1].strip() for row in rows}
+    return {src: slug for src, slug in aliases.items() if src and slug}
+
+
+@lru_cache(maxsize=256)
+def _slug_city(city: str) -> str:
+    # "Lincoln, Neb." -> "lincoln"
+    return slugify(_city_tail_re.sub("", city))
+
+
+@lru_cache(maxsize=256)
+def _stadium_slug(venue: str, city: str | None) -> str:
+    # Alias wins; otherwise "<venue>-<city>" unless the venue already names the city
+    aliases = load_aliases()
+    if venue in aliases:
+        return aliases[venue]
+    tag = "-" + _slug_city(city) if city else ""
+    base_slug = slugify(venue or (city or "stadium"))
+    return base_slug + (tag if tag and base_slug not in tag else "")
+
+
+def _parse_inputs_key() -> str:
+    # Everything besides the HTML that parse_schedule's output depends on:
+    # the current month (season-year inference), the venue alias file, and
+    # the parser itself (source of this module and scraper/utils.py), so a
+    # code change is never answered with the old parser's schedule.json.
+    aliases_csv = ASSETS_STADIUMS / "aliases.csv"
+    aliases = aliases_csv.read_bytes() if aliases_csv.exists() else b""
+    code = hashlib.sha256()
+    for src in (__file__, utils.__file__):
+        code.update(Path(src).read_bytes())
+    return (f"{datetime.now():%Y-%m}:{hashlib.sha256(aliases).hexdigest()[:16]}"
+            f":{code.hexdigest()[:16]}")
+
+
+def get_html(url: str) -> tuple[str | None, dict]:
+    """Fetch the page; returns (html, cache_meta).
+
+    html is None when last run's schedule.json still holds: on a 304, or when
+    the body hashes the same as last time. Either shortcut is only taken while
+    data/schedule.json exists and the other parse inputs (see
+    _parse_inputs_key) are unchanged. cache_meta is not saved here; main()
+    writes it to SCHEDULE_CACHE once schedule.json has been published.
+    """
+    inputs = _parse_inputs_key()
+    meta: dict = {}
+    if SCHEDULE_CACHE.exists() and (DATA / "schedule.json").exists():
+        try:
+            meta = json.loads(SCHEDULE_CACHE.read_text(encoding="utf-8"))
+        except ValueError:
+            meta = {}
+    if meta.get("url") != url or meta.get("inputs") != inputs:
+        meta = {}
+
+    headers = {}
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    r = SESSION.get(url, timeout=30, headers=headers)
+    if r.status_code == 304:
+        return None, meta
     r.raise_for_status()
-    return r.text
+
+    sha = hashlib.sha256(r.content).hexdigest()
+    new_meta = {
+        "url": url,
+        "inputs": inputs,
+        "etag": r.headers.get("ETag"),
+        "last_modified": r.headers.get("Last-Modified"),
+        "sha256": sha,
+    }
+    if meta.get("sha256") == sha:
+        return None, new_meta  # same bytes as last run (server without ETag support)
+    return r.text, new_meta
+
+
+def _clean(s: str | None) -> str:
+    # Collapse whitespace runs; str.split() does this without the regex engine
+    return " ".join(s.split()) if s else ""
+
+
+def _parse_date_tokens(date_txt: str, now: datetime):
+    # Ex: "Thursday Aug 28" or "Sat Sep 6"
+    m = _date_re.search(date_txt)
+    if not m:
+        return None, None, None, None
+    weekday = m.group(1).upper() if m.group(1) else None
+    month_str, day = m.group(2).lower(), int(m.group(3))
+    mm = _MONTH_MAP[month_str]  # the regex only admits known month names
+    year = now.year
+    # If month already passed by more than a month, assume next year
+    if mm < now.month - 1:
+        year = now.year + 1
+    return weekday, month_str[:3].title(), day, year
+
+
+def _determine_site(va: str, city: str | None) -> str:
+    # va is already normalized to "vs." / "at" by _teams_re
+    if va == "at":
+        return "away"
+    if city and "lincoln" in city.casefold():
+        return "home"
+    return "neutral"
+
+
+def _parse_row(date_col: str, teams_col: str, loc_col: str, time_col: str, now: datetime) -> dict:
+    # One schedule table row (already whitespace-cleaned cells) → game dict.
+    # Kept free of DOM objects so the hot loop is plain str/regex work.
+    # Teams: "vs.\nCincinnati" or "at\nMaryland"
+    va = "vs."
+    opp_name = teams_col
+    mteams = _teams_re.search(teams_col)
+    if mteams:
+        va = mteams.group(1).lower()
+        opp_name = mteams.group(2).strip()
+
+    # Location "City, ST / Venue"
+    city, venue = None, None
+    if " / " in loc_col:
+        city, venue = [x.strip() for x in loc_col.split(" / ", 1)]
+    else:
+        parts = [p.strip() for p in _loc_split_re.split(loc_col) if p.strip()]
+        if parts:
+            city = parts[0]
+
+    # Time (strip result text; keep "6:30 PM CDT" or "TBA")
+    tv = None
+    tba = False
+    time_local = None
+    kickoff = None
+    if not time_col or time_col.upper() == "TBA":
+        tba = True
+        time_local = "TBA"
+    else:
+        mt = _time_re.search(time_col)
+        if mt:
+            time_local = mt.group(0).upper()
+            hh = int(mt.group("h"))
+            if mt.group("ap").upper() == "PM":
+                hh = hh % 12 + 12
+            elif hh == 12:
+                hh = 0
+            kickoff = (hh, int(mt.group("m")))
+        else:
+            tba = True
+            time_local = "TBA"
+
+    # Date → ISO (and weekday if present)
+    weekday, mo3, day, year = _parse_date_tokens(date_col, now)
+    date_obj = None
+    date_iso = None
+    date_str = None
+    if mo3 and day and year:
+        date_str = f"{mo3} {day}"
+        date_obj = datetime(year, _MONTH3_TO_INT[mo3], day)
+        if kickoff:
+            date_obj = date_obj.replace(hour=kickoff[0], minute=kickoff[1])
+        date_iso = date_obj.isoformat()
+
+    site = _determine_site(va, city)
+    opp_slug = slugify(opp_name) if opp_name else None
+
+    # Stadium slug (alias if provided)
+    venue_label = venue or ""
+    venue_slug = _stadium_slug(venue_label, city)
+
+    return {
+        "date_iso": date_iso,
+        "weekday": weekday or (_WEEKDAYS[date_obj.weekday()] if date_obj else None),
+        "date_str": date_str or date_col,
+        "time_local": time_local,
+        "tba": tba,
+        "site": site,
+        "va": va,
+        "opponent_name": opp_name,
+        "opponent_slug": opp_slug,
+        "location_city": city,
+        "location_venue": venue_label,
+        "stadium_slug": venue_slug,
+        "tv_network": tv,  # TV may be filled by enrichment
+        "status": "scheduled",
+        "_sortkey": date_obj,  # dropped before writing (see main)
+    }
+
+
+def _loose_card(slug: str, card_by_token: dict) -> dict | None:
+    # Substring match among cards that share the first slug word
+    # ("michigan" -> "michigan-wolverines")
+    for a, ci in card_by_token.get(slug.split("-")[0], ()):
+        if a in slug or slug in a:
+            return ci
+    return None
 
 
 def parse_schedule(html: str) -> list[dict]:
-    soup = BeautifulSoup(html, "lxml")
+    tree = lxml.html.fromstring(html)
+    now = datetime.now()
 
     games: list[dict] = []
 
     # ---------- Table-first parsing ----------
-    target_table = None
-    for table in soup.find_all("table"):
-        heads = [th.get_text(" ", strip=True).lower() for th in table.find_all("th")]
-        if not heads:
-            thead = table.find("thead")
-            if thead:
-                heads = [th.get_text(" ", strip=True).lower() for th in thead.find_all("th")]
-        if any("date" in h for h in heads) and any("location" in h for h in heads):
-            target_table = table
-            break
-
-    def clean(s: str | None) -> str:
-        return re.sub(r"\s+", " ", (s or "").strip())
-
-    def parse_date_tokens(date_txt: str):
-        # Ex: "Thursday Aug 28" or "Sat Sep 6"
-        m = re.search(
-            r"(Mon|Tue|Wed|Thu|Fri|Sat|Sun)[a-z]*\s+([A-Z][a-z]{2,})\s+(\d{1,2})",
-            date_txt,
-            re.I,
-        )
-        if not m:
-            m = re.search(r"([A-Z][a-z]{2,})\s+(\d{1,2})", date_txt, re.I)
-            if not m:
-                return None, None, None, None
-            weekday = None
-            month_str, day = m.group(1).title(), int(m.group(2))
-        else:
-            weekday = m.group(1).upper()
-            month_str, day = m.group(2).title(), int(m.group(3))
-
-        month_map = {
-            "Jan": 1, "January": 1, "Feb": 2, "February": 2, "Mar": 3, "March": 3,
-            "Apr": 4, "April": 4, "May": 5, "Jun": 6, "June": 6, "Jul": 7, "July": 7,
-            "Aug": 8, "August": 8, "Sep": 9, "Sept": 9, "September": 9,
-            "Oct": 10, "October": 10, "Nov": 11, "November": 11, "Dec": 12, "December": 12
-        }
-        mm = month_map.get(month_str)
-        if not mm:
-            return None, None, None, None
-        now = datetime.now()
-        year = now.year
-        # If month already passed by more than a month, assume next year
-        if mm < now.month - 1:
-            year = now.year + 1
-        return weekday, month_str[:3], day, year
-
-    def determine_site(va_txt: str | None, city: str | None) -> str:
-        va_txt = (va_txt or "").lower()
-        city = (city or "").lower()
-        if "at" in va_txt:
-            return "away"
-        if "lincoln" in city:
-            return "home"
-        return "neutral"
-
-    if target_table:
-        tbody = target_table.find("tbody") or target_table
-        for tr in tbody.find_all("tr"):
-            tds = tr.find_all(["td", "th"])
+    target_table = _first(_xp_table, tree)
+    if target_table is not None:
+        tbody = _first(_xp_tbody, target_table)
+        if tbody is None:
+            tbody = target_table
+        for tr in _xp_rows(tbody):
+            tds = _xp_cells(tr)
             if len(tds) < 4:
                 continue
-
-            date_col = clean(tds[0].get_text(" ", strip=True))
-            teams_col = clean(tds[1].get_text("\n", strip=True))
-            loc_col = clean(tds[2].get_text(" ", strip=True))
-            time_col = clean(tds[3].get_text(" ", strip=True))
-
-            # Teams: "vs.\nCincinnati" or "at\nMaryland"
-            va = "vs."
-            opp_name = teams_col
-            mteams = re.search(r"^(vs\.|at)\s*(.*)$", teams_col, re.I | re.M)
-            if mteams:
-                va = mteams.group(1).lower()
-                opp_name = mteams.group(2).strip()
-
-            # Location "City, ST / Venue"
-            city, venue = None, None
-            if " / " in loc_col:
-                city, venue = [x.strip() for x in loc_col.split(" / ", 1)]
-            else:
-                parts = [p.strip() for p in re.split(r"\s{2,}|\|", loc_col) if p.strip()]
-                if parts:
-                    city = parts[0]
-
-            # Time (strip result text; keep "6:30 PM CDT" or "TBA")
-            tv = None
-            tba = False
-            time_local = None
-            if not time_col or time_col.upper() == "TBA":
-                tba = True
-                time_local = "TBA"
-            else:
-                mt = re.search(r"\b(\d{1,2}:\d{2}\s*[AP]M(?:\s*[A-Z]{2,3}T)?)\b", time_col, re.I)
-                if mt:
-                    time_local = mt.group(1).upper().replace(".", "")
-                else:
-                    tba = True
-                    time_local = "TBA"
-
-            # Date → ISO (and weekday if present)
-            weekday, mo3, day, year = parse_date_tokens(date_col)
-            date_iso = None
-            date_str = None
-            if mo3 and day and year:
-                date_str = f"{mo3} {day}"
-                mm_map = {"Jan":1,"Feb":2,"Mar":3,"Apr":4,"May":5,"Jun":6,"Jul":7,"Aug":8,"Sep":9,"Oct":10,"Nov":11,"Dec":12}
-                if not tba and time_local:
-                    mt2 = re.match(r"(\d{1,2}):(\d{2})\s*([AP]M)", time_local, re.I)
-                    if mt2:
-                        hh = int(mt2.group(1))
-                        mm = int(mt2.group(2))
-                        ampm = mt2.group(3).upper()
-                        if ampm == "PM" and hh != 12:
-                            hh += 12
-                        if ampm == "AM" and hh == 12:
-                            hh = 0
-                        date_iso = datetime(year, mm_map[mo3], day, hh, mm).isoformat()
-                    else:
-                        date_iso = datetime(year, mm_map[mo3], day).isoformat()
-                else:
-                    date_iso = datetime(year, mm_map[mo3], day).isoformat()
-
-            site = determine_site(va, city)
-            opp_slug = slugify(opp_name) if opp_name else None
-
-            # Stadium slug (alias if provided)
-            venue_label = venue or ""
-            if venue_label in ALIASES:
-                venue_slug = ALIASES[venue_label]
-            else:
-                tag = "-" + slugify(re.sub(r",.*$", "", city)) if city else ""
-                base = venue_label or (city or "stadium")
-                base_slug = slugify(base)
-                venue_slug = base_slug + (tag if tag and base_slug not in tag else "")
-
-            games.append({
-                "date_iso": date_iso,
-                "weekday": weekday or (date_str or "").split()[0].upper() if date_str else None,
-                "date_str": date_str or date_col,
-                "time_local": time_local,
-                "tba": tba,
-                "site": site,
-                "va": va,
-                "opponent_name": opp_name,
-                "opponent_slug": opp_slug,
-                "location_city": city,
-                "location_venue": venue_label,
-                "stadium_slug": venue_slug,
-                "tv_network": tv,  # TV may be filled by enrichment
-                "status": "scheduled",
-            })
+            games.append(_parse_row(
+                _clean(text_of(tds[0])),
+                _clean(text_of(tds[1], "\n")),
+                _clean(text_of(tds[2])),
+                _clean(text_of(tds[3])),
+                now,
+            ))
 
     # ---------- Enrichment from card markup (logos, TV, better loc) ----------
     card_info: list[dict] = []
 
-    for card in soup.select("div.schedule-event-item-default"):
+    # TV logos sit in each card's outer .schedule-event-item wrapper, beside the
+    # card itself. Pair them up top-down once (a nested wrapper, visited later,
+    # overrides its parent, matching the nearest-ancestor rule).
+    tv_img_by_card: dict = {}
+    for outer in _xp_outer(tree):
+        tv_img = _first(_xp_tv_img, outer)
+        for card in _xp_inner_cards(outer):
+            tv_img_by_card[card] = tv_img
+
+    for card in _xp_cards(tree):
+        parts, imgs_block, alt_imgs = _card_parts(card)
+
         # Opponent name
-        on_el = card.select_one(".schedule-event-item-default__opponent-name")
-        opp_name_clean = on_el.get_text(strip=True) if on_el else None
+        on_el = parts.get("opp")
+        opp_name_clean = text_of(on_el, "") if on_el is not None else None
+        opp_slug = slugify(opp_name_clean) if opp_name_clean else ""
 
         # vs/at
-        va_el = card.select_one(".schedule-event-item-default__divider")
-        va_txt = (va_el.get_text(strip=True).lower() if va_el else None)
+        va_el = parts.get("va")
+        va_txt = (text_of(va_el, "").lower() if va_el is not None else None)
         if va_txt not in ("vs.", "at"):
             va_txt = "vs."
 
         # Opponent logo: team images live under __images; last is opponent.
         logo_url = None
 
-        def first_from_srcset(s: str | None) -> str | None:
-            if not s:
-                return None
-            return s.split(",")[0].strip().split(" ")[0]
-
-        imgs_block = card.select(".schedule-event-item-default__images img")
         if imgs_block:
-            opp_img = imgs_block[-1]  # usually [Nebraska, Opponent]
-            url_candidates = [
-                opp_img.get("data-src"),
-                first_from_srcset(opp_img.get("data-srcset")),
-                first_from_srcset(opp_img.get("srcset")),
-                opp_img.get("src"),
-            ]
-            for u in url_candidates:
-                if u and not u.startswith("data:image"):
-                    logo_url = u
-                    break
+            logo_url = _img_url(imgs_block[-1])  # usually [Nebraska, Opponent]
 
         # Fallback: fuzzy alt match (e.g., “Bearcats”)
         if not logo_url and opp_name_clean:
             on_cf = opp_name_clean.casefold()
-            for im in card.select("img[alt]"):
+            for im in alt_imgs:
                 alt = (im.get("alt") or "").strip()
                 alt_cf = alt.casefold()
                 if "nebraska" in alt_cf:
                     continue
-                if on_cf in alt_cf or slugify(alt) == slugify(opp_name_clean):
-                    url_candidates = [
-                        im.get("data-src"),
-                        first_from_srcset(im.get("data-srcset")),
-                        first_from_srcset(im.get("srcset")),
-                        im.get("src"),
-                    ]
-                    for u in url_candidates:
-                        if u and not u.startswith("data:image"):
-                            logo_url = u
-                            break
+                if on_cf in alt_cf or slugify(alt) == opp_slug:
+                    logo_url = _img_url(im)
                 if logo_url:
                     break
 
         # Location "City, ST / Venue"
-        loc_el = card.select_one(".schedule-event-location")
-        loc_txt = loc_el.get_text(" ", strip=True) if loc_el else None
+        loc_el = parts.get("loc")
+        loc_txt = text_of(loc_el) if loc_el is not None else None
         city, venue = None, None
         if loc_txt:
             if " / " in loc_txt:
@@ -284,15 +459,16 @@ def parse_schedule(html: str) -> list[dict]:
 
         # TV: image alt inside the bottom list (scope to this card)
         tv_alt = None
-        container = card.find_parent(class_="schedule-event-item") or card
-        bottom = container.select_one(".schedule-event-bottom__list")
-        if bottom:
-            im = bottom.select_one("a.schedule-event-bottom__link img[alt]")
-            if im:
-                tv_alt = (im.get("alt") or "").strip()
+        if card in tv_img_by_card:
+            im = tv_img_by_card[card]
+        else:
+            im = _first(_xp_tv_img, card)  # card without a wrapper
+        if im is not None:
+            tv_alt = (im.get("alt") or "").strip()
 
         card_info.append({
             "opp_name": opp_name_clean,
+            "opp_slug": opp_slug,
             "va": va_txt,
             "city": city,
             "venue": venue,
@@ -303,81 +479,132 @@ def parse_schedule(html: str) -> list[dict]:
     def tv_norm(tv_alt: str | None) -> str | None:
         if not tv_alt:
             return None
-        key = re.sub(r"[^a-z0-9 ]+", "", tv_alt.lower().strip())
+        key = _tv_junk_re.sub("", tv_alt.lower().strip())
         return normalize_tv(key) or normalize_tv(tv_alt)
 
-    # Merge enrichment into parsed games by opponent name (loose match)
-    for g in games:
-        name = (g.get("opponent_name") or "").strip()
-        best = None
-        for ci in card_info:
-            if not ci["opp_name"]:
-                continue
-            a, b = ci["opp_name"].casefold(), name.casefold()
-            if a and (a in b or b in a):
-                best = ci
-                break
-        if best:
-            g["opponent_name"] = best["opp_name"] or g["opponent_name"]
-            g["opponent_slug"] = slugify(best["opp_name"]) if best["opp_name"] else g.get("opponent_slug")
-            g["va"] = best["va"] or g.get("va")
-            if best["city"]:
-                g["location_city"] = best["city"]
-            if best["venue"]:
-                g["location_venue"] = best["venue"]
-                tag = "-" + slugify(re.sub(r",.*$", "", best["city"])) if best["city"] else ""
-                base_slug = slugify(best["venue"])
-                g["stadium_slug"] = base_slug + (tag if tag and base_slug not in tag else "")
-            g["opponent_logo_url"] = best["logo"] or g.get("opponent_logo_url")
-            g["tv_network"] = tv_norm(best["tv_alt"]) or g.get("tv_network")
+    # Index cards by opponent slug, and by each slug word for the loose fallback
+    card_by_slug: dict[str, dict] = {}
+    card_by_token: dict[str, list[tuple[str, dict]]] = {}
+    for ci in card_info:
+        a = ci["opp_slug"]
+        if not a:
+            continue
+        card_by_slug.setdefault(a, ci)
+        for tok in a.split("-"):
+            card_by_token.setdefault(tok, []).append((a, ci))
+
+    # Merge enrichment into parsed games by opponent name (exact, then loose match)
+    if card_by_slug:
+        for g in games:
+            b = g.get("opponent_slug") or ""
+            best = card_by_slug.get(b) if b else None
+            if best is None and b:
+                best = _loose_card(b, card_by_token)
+            if best:
+                g["opponent_name"] = best["opp_name"] or g["opponent_name"]
+                g["opponent_slug"] = best["opp_slug"] or g.get("opponent_slug")
+                g["va"] = best["va"] or g.get("va")
+                if best["city"]:
+                    g["location_city"] = best["city"]
+                if best["venue"]:
+                    g["location_venue"] = best["venue"]
+                    g["stadium_slug"] = _stadium_slug(best["venue"], best["city"])
+                g["opponent_logo_url"] = best["logo"] or g.get("opponent_logo_url")
+                g["tv_network"] = tv_norm(best["tv_alt"]) or g.get("tv_network")
 
     # Final filter
     games = [g for g in games if g.get("opponent_name")]
     return games
 
 
-def write_json(path: Path, obj) -> bool:
-    old = None
-    if path.exists():
-        try:
-            old = json.loads(path.read_text(encoding="utf-8"))
-        except Exception:
-            old = None
-    new_txt = json.dumps(obj, ensure_ascii=False, indent=2)
-    if old is None or json.dumps(old, ensure_ascii=False, indent=2) != new_txt:
-        path.write_text(new_txt + "\n", encoding="utf-8")
-        return True
-    return False
+def dump_json(obj) -> bytes:
+    # orjson and the stdlib fallback emit byte-identical indent=2 output
+    # (OPT_NON_STR_KEYS: accept int keys like json.dumps does)
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+        )
+    return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    # Write beside the target then rename, so readers never see a half-written file
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def write_json(paths: Path | list[Path], obj) -> bool:
+    # Encode once, then write each destination whose bytes differ.
+    # Returns True if any file changed.
+    if isinstance(paths, Path):
+        paths = [paths]
+    new_bytes = dump_json(obj)
+    changed = False
+    for path in paths:
+        if path.exists():
+            try:
+                if path.read_bytes() == new_bytes:
+                    continue
+            except OSError:
+                pass
+        _atomic_write(path, new_bytes)
+        changed = True
+    return changed
 
 
 def main() -> int:
-    html = get_html(SCHEDULE_URL)
-    games = parse_schedule(html)
-
-    # Sort (date first, then name)
-    def sort_key(g):
-        di = g.get("date_iso")
-        return di or f"zzz-{g.get('opponent_name','')}"
-    games.sort(key=sort_key)
-
-    write_json(DATA / "schedule.json", games)
+    for p in (DATA, DOCS, ASSETS_STADIUMS):
+        p.mkdir(parents=True, exist_ok=True)
+
+    # Fetch the page while the local alias file and stadium images are read
+    with ThreadPoolExecutor(max_workers=2) as ex:
+        html_future = ex.submit(get_html, SCHEDULE_URL)
+        load_aliases()
+        with os.scandir(ASSETS_STADIUMS) as it:
+            existing_stadiums = {
+                e.name[:-4] for e in it if e.name.endswith(".jpg") and e.is_file()
+            }
+        html, cache_meta = html_future.result()
+
+    if html is None:
+        # Page unchanged (304 or same content hash): skip the parse
+        games = json.loads((DATA / "schedule.json").read_text(encoding="utf-8"))
+    else:
+        games = parse_schedule(html)
+
+        # Sort (date first, then name); undated games go last
+        games.sort(key=lambda g: (
+            g["_sortkey"] is None,
+            g["_sortkey"] or datetime.max,
+            g.get("opponent_name") or "",
+        ))
+        for g in games:
+            del g["_sortkey"]
+
+    # Each file goes to data/ and is mirrored into docs/ (so the site can
+    # fetch without path/CORS issues) from the same encoded buffer
+    def publish(fname: str, obj) -> bool:
+        return write_json([DATA / fname, DOCS / fname], obj)
+
+    publish("schedule.json", games)
+    # Only now do the validators describe what schedule.json holds; saving them
+    # earlier would let a failed parse be skipped as "unchanged" next run
+    _atomic_write(SCHEDULE_CACHE, json.dumps(cache_meta).encode("utf-8"))
 
     # Stadium needs (unique slugs)
     slugs = sorted({g["stadium_slug"] for g in games if g.get("stadium_slug")})
-    write_json(DATA / "stadiums_needed.json", slugs)
+    publish("stadiums_needed.json", slugs)
 
     # Missing images vs /assets/stadiums/*.jpg (source of truth), for your checklist
-    missing = [slug for slug in slugs if not (ASSETS_STADIUMS / f"{slug}.jpg").exists()]
-    write_json(DATA / "stadiums_missing.json", missing)
-
-    # Mirror JSON into docs/ so the site can fetch without path/CORS issues
-    for fname in ["schedule.json", "stadiums_needed.json", "stadiums_missing.json"]:
-        src = DATA / fname
-        dst = DOCS / fname
-        if src.exists():
-            txt = src.read_text(encoding="utf-8")
-            if not dst.exists() or dst.read_text(encoding="utf-8") != txt:
-                dst.write_text(txt, encoding="utf-8")
+    missing = [slug for slug in slugs if slug not in existing_stadiums]
+    publish("stadiums_missing.json", missing)
 
     print(f"Scraped {len(games)} games. Stadium images missing: {len(missing)} → {missing}")
     return 0
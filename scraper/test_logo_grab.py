@@ -9,18 +9,24 @@ Outputs (all relative to repo root):
   - docs/assets/opponents/_fetched/*  (downloaded logo files if retrievable)
 
 Run locally:
-  pip install playwright requests beautifulsoup4 lxml
+  pip install playwright requests lxml
   python -m playwright install chromium
   python -m scraper.test_logo_grab_playwright
 """
 
 from __future__ import annotations
-import asyncio, json, re, sys
+import asyncio, json, os, re, shutil, sys, tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from urllib.parse import urlparse
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml import etree
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from scraper.utils import has_class, text_of
 
 # --- Paths ---
 ROOT = Path(__file__).resolve().parents[1]
@@ -31,15 +37,42 @@ for p in (DATA, OUT_DIR):
     p.mkdir(parents=True, exist_ok=True)
 
 URL = "https://huskers.com/sports/football/schedule"
+MAX_LOGO_BYTES = 5_000_000
+
+
+# Card lookups, compiled once (tried in order, like the old select() fallback chain)
+XP_CARDS = (
+    etree.XPath(f"//div[{has_class('schedule-event-item-default')}]"),
+    etree.XPath(f"//div[{has_class('schedule-event-item')}]"),
+    etree.XPath(f"//li[{has_class('schedule__list-item')}]"),
+)
+XP_OPP_NAME = etree.XPath(f"(.//*[{has_class('schedule-event-item-default__opponent-name')}])[1]")
+XP_OPP_NAME_ALT = etree.XPath(f"(.//*[{has_class('opponent')} or {has_class('team')}])[1]")
+XP_IMG_WRAP = etree.XPath(f"(.//*[{has_class('schedule-event-item-default__images')}])[1]")
+XP_IMGS = etree.XPath(".//img")
+XP_ALT_IMGS = etree.XPath(".//img[@alt]")
+
+# The snapshot is handed to lxml as UTF-8 bytes; say so rather than let it sniff
+UTF8_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# Shared keep-alive pool: logos come from one or two hosts, so reuse the TLS connection
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+))
 
 
 # --- Helpers ---
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
 def slugify(s: str | None) -> str:
     if not s:
         return ""
-    s = s.lower().strip()
-    s = re.sub(r"[^a-z0-9]+", "-", s)
-    return re.sub(r"-+", "-", s).strip("-")
+    # [^a-z0-9]+ already swallows existing dashes, so one substitution is enough
+    return _NON_ALNUM_RE.sub("-", s.lower().strip()).strip("-")
 
 
 def first_from_srcset(s: str | None) -> str | None:
@@ -59,13 +92,48 @@ def ext_from(u: str) -> str:
     return ext if ext in (".svg", ".png", ".jpg", ".jpeg", ".webp") else ".svg"
 
 
+def download_logo(u: str, out: Path) -> None:
+    # Stream to disk; bail out before reading the body if it can't be a logo
+    with SESSION.get(u, stream=True, timeout=30) as resp:
+        resp.raise_for_status()
+        size = int(resp.headers.get("Content-Length") or 0)
+        if size > MAX_LOGO_BYTES:
+            raise ValueError(f"response too large for a logo ({size} bytes)")
+        if resp.headers.get("Content-Type", "").startswith("text/html"):
+            raise ValueError("got an HTML page instead of an image")
+        resp.raw.decode_content = True
+        # Stream into a temp file beside the logo and swap it in once complete,
+        # so a broken download never truncates a good logo from an earlier run
+        fd, tmp = tempfile.mkstemp(dir=out.parent, prefix=f".{out.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                shutil.copyfileobj(resp.raw, f, length=65536)
+            os.chmod(tmp, 0o644)  # mkstemp creates 0600
+            os.replace(tmp, out)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def extract_img(img) -> str | None:
+    # lxml <img>: first real URL from data-src, data-srcset, srcset, src (in that order)
+    attrib = img.attrib
+    for k in ("data-src", "data-srcset", "srcset", "src"):
+        u = attrib.get(k)
+        if u and k.endswith("srcset"):
+            u = first_from_srcset(u)
+        if u and not is_placeholder(u):
+            return u
+    return None
+
+
 # --- Main ---
 async def main() -> int:
     try:
         from playwright.async_api import async_playwright
     except ImportError:
         print("Playwright not installed. Do:\n"
-              "  pip install playwright requests beautifulsoup4 lxml\n"
+              "  pip install playwright requests lxml\n"
               "  python -m playwright install chromium")
         return 2
 
@@ -86,40 +154,31 @@ async def main() -> int:
         await page.wait_for_timeout(400)
 
         # Snapshot rendered DOM
-        html = await page.content()
-        (DATA / "schedule_raw_rendered.html").write_text(html, encoding="utf-8")
+        # Encode once: the same bytes go to disk and to the parser, and the
+        # str copy is dropped so the page isn't held twice next to the tree.
+        raw = (await page.content()).encode("utf-8")
+        (DATA / "schedule_raw_rendered.html").write_bytes(raw)
         print("Saved: data/schedule_raw_rendered.html")
 
-        soup = BeautifulSoup(html, "lxml")
-        cards = (soup.select("div.schedule-event-item-default")
-                 or soup.select("div.schedule-event-item")
-                 or soup.select("li.schedule__list-item"))
+        tree = lxml.html.fromstring(raw, parser=UTF8_HTML_PARSER)
+        del raw
+        cards = []
+        for xp in XP_CARDS:
+            cards = xp(tree)
+            if cards:
+                break
         print(f"Rendered cards found: {len(cards)}")
 
-        def extract_img(img) -> str | None:
-            for k in ("data-src",):
-                u = img.get(k)
-                if u and not is_placeholder(u):
-                    return u
-            u = first_from_srcset(img.get("data-srcset")) or first_from_srcset(img.get("srcset"))
-            if u and not is_placeholder(u):
-                return u
-            u = img.get("src")
-            if u and not is_placeholder(u):
-                return u
-            return None
-
         rows = []
         for card in cards:
             # Opponent name
-            on = (card.select_one(".schedule-event-item-default__opponent-name")
-                  or card.select_one(".opponent,.team"))
-            opp_name = on.get_text(" ", strip=True) if on else None
+            on = XP_OPP_NAME(card) or XP_OPP_NAME_ALT(card)
+            opp_name = text_of(on[0]) if on else None
             opp_slug = slugify(opp_name)
 
             # Images: wrapper usually contains [Nebraska, Opponent] in that order
-            wrap = card.select_one(".schedule-event-item-default__images")
-            imgs = (wrap.find_all("img") if wrap else card.find_all("img"))
+            wrap = XP_IMG_WRAP(card)
+            imgs = XP_IMGS(wrap[0] if wrap else card)
 
             logo_url = None
             if imgs:
@@ -131,7 +190,7 @@ async def main() -> int:
             # Fallback: any image alt loosely matching opponent name (avoid "nebraska")
             if not logo_url and opp_name:
                 on_cf = opp_name.casefold()
-                for im in card.select("img[alt]"):
+                for im in XP_ALT_IMGS(card):
                     alt = (im.get("alt") or "").lower()
                     if not alt or "nebraska" in alt:
                         continue
@@ -153,21 +212,33 @@ async def main() -> int:
         print("Saved: data/opponent_logos_found.json")
 
         # Try to download logos so the site can use local files immediately
-        saved = 0
+        tasks = []
         for r in rows:
             u, slug = r.get("logo_url"), r.get("opponent_slug")
             if not (u and slug):
                 print(f"SKIP: {r.get('opponent_name')} → no logo URL")
                 continue
+            tasks.append((slug, u, OUT_DIR / f"{slug}{ext_from(u)}"))
+
+        def fetch(task):
+            slug, u, out = task
             try:
-                resp = requests.get(u, timeout=30)
-                resp.raise_for_status()
-                out = OUT_DIR / f"{slug}{ext_from(u)}"
-                out.write_bytes(resp.content)
+                download_logo(u, out)
+                return slug, out, None
+            except Exception as e:
+                return slug, out, e
+
+        # Downloads overlap on the shared session; results come back in task order
+        with ThreadPoolExecutor(max_workers=8) as ex:
+            results = list(ex.map(fetch, tasks))
+
+        saved = 0
+        for slug, out, err in results:
+            if err is None:
                 saved += 1
                 print(f"Downloaded {slug} → {out}")
-            except Exception as e:
-                print(f"Download failed for {slug}: {e}")
+            else:
+                print(f"Download failed for {slug}: {err}")
 
         await ctx.close()
         await browser.close()
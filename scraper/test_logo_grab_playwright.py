@@ -4,42 +4,144 @@
 Render Huskers schedule with Playwright (Chromium), then extract opponent logos.
 
 Outputs (all relative to repo root):
-  - data/schedule_raw_rendered.html   (post-JS DOM snapshot)
-  - data/opponent_logos_found.json    (opponent_name/slug/logo_url)
+  - data/schedule_cards_rendered.json (cards as extracted in the browser)
+  - data/schedule_raw_rendered.html   (post-JS DOM snapshot, only with --debug)
+  - data/opponent_logos_found.json    (opponent_name/slug/logo_url + logo ETag/Last-Modified)
   - docs/assets/opponents/_fetched/*  (downloaded logo files if retrievable)
 
 Run locally:
-  pip install playwright requests beautifulsoup4 lxml
+  pip install playwright requests aiohttp orjson
   python -m playwright install chromium
-  python -m scraper.test_logo_grab_playwright
+  python -m scraper.test_logo_grab_playwright [--debug]
+
+Cards extracted less than SCRAPE_HTML_TTL seconds ago (default 900) are
+re-used without starting the browser; set FORCE_REFRESH=1 to always render.
 """
 
 from __future__ import annotations
-import asyncio, json, re, sys
+import asyncio, json, os, re, shutil, sys, tempfile, time
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from urllib.parse import urlparse
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import aiohttp  # optional: concurrent logo downloads
+except ImportError:
+    aiohttp = None
+
+try:
+    import orjson  # optional, faster JSON encoder
+except ImportError:
+    orjson = None
 
 # --- Paths ---
 ROOT = Path(__file__).resolve().parents[1]
 DATA = ROOT / "data"
 DOCS = ROOT / "docs"
 OUT_DIR = DOCS / "assets" / "opponents" / "_fetched"
-for p in (DATA, OUT_DIR):
-    p.mkdir(parents=True, exist_ok=True)
 
 URL = "https://huskers.com/sports/football/schedule"
 
+# Only the DOM is needed (logo URLs are read from attributes, then fetched
+# separately), so the browser never downloads these
+BLOCKED_RESOURCES = frozenset({"image", "media", "font", "stylesheet"})
+CHROMIUM_ARGS = ["--disable-dev-shm-usage", "--disable-gpu", "--disable-extensions"]
+
+# Polled after scrolling to the bottom: true once some cards exist and their
+# count has not changed for CARDS_SETTLE_MS (lazy-loaded cards have arrived)
+CARDS_SETTLE_MS = 500
+CARDS_SETTLED_JS = """ms => {
+  const n = document.querySelectorAll(
+    'div.schedule-event-item-default, div.schedule-event-item, li.schedule__list-item').length;
+  const now = performance.now();
+  const seen = window.__huskerCards;
+  if (!seen || seen.n !== n) {
+    window.__huskerCards = {n, since: now};
+    return false;
+  }
+  return n > 0 && now - seen.since >= ms;
+}"""
+
+# The one card extractor: picks the card tier, opponent name and logo <img>
+# candidates in the page; build_row() turns each result into a report row.
+# Attributes come back raw (getAttribute), as written in the markup.
+EXTRACT_CARDS_JS = """() => {
+  // One query for every tier, then keep the first tier that matched
+  const all = Array.from(document.querySelectorAll(
+    'div.schedule-event-item-default, div.schedule-event-item, li.schedule__list-item'));
+  let cards = [];
+  for (const sel of ['div.schedule-event-item-default', 'div.schedule-event-item',
+                     'li.schedule__list-item']) {
+    cards = all.filter(el => el.matches(sel));
+    if (cards.length) break;
+  }
+  const attrs = img => ({
+    'data-src': img.getAttribute('data-src'),
+    'data-srcset': img.getAttribute('data-srcset'),
+    'srcset': img.getAttribute('srcset'),
+    'src': img.getAttribute('src'),
+    'alt': img.getAttribute('alt'),
+  });
+  const text = el => {
+    // Stripped text nodes joined with single spaces, skipping script/style
+    const parts = [];
+    const walk = document.createTreeWalker(el, NodeFilter.SHOW_TEXT);
+    while (walk.nextNode()) {
+      const node = walk.currentNode;
+      if (node.parentElement.closest('script, style, template')) continue;
+      const t = node.nodeValue.trim();
+      if (t) parts.push(t);
+    }
+    return parts.join(' ');
+  };
+  return Array.from(cards, card => {
+    const names = Array.from(card.querySelectorAll(
+      '.schedule-event-item-default__opponent-name, .opponent, .team'));
+    const on = names.find(el => el.matches('.schedule-event-item-default__opponent-name'))
+            || names[0];
+    const wrap = card.querySelector('.schedule-event-item-default__images');
+    const imgs = (wrap || card).querySelectorAll('img');
+    return {
+      name: on ? text(on) : null,
+      img: imgs.length ? attrs(imgs[imgs.length - 1]) : null,
+      alts: Array.from(card.querySelectorAll('img[alt]'), attrs),
+    };
+  });
+}"""
+
+# Pooled session for the synchronous download path (one handshake per host)
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=(502, 503, 504)),
+))
+
 
 # --- Helpers ---
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9]+")
+
+
 def slugify(s: str | None) -> str:
-    if not s:
-        return ""
-    s = s.lower().strip()
-    s = re.sub(r"[^a-z0-9]+", "-", s)
-    return re.sub(r"-+", "-", s).strip("-")
+    # None/"" never reach the cache
+    return _slugify(s) if s else ""
+
+
+@lru_cache(maxsize=512)
+def _slugify(s: str) -> str:
+    # [^a-z0-9]+ already swallows existing dashes, so one substitution is enough
+    return _NON_ALNUM_RE.sub("-", s.lower().strip()).strip("-")
+
+
+def dump_json(obj) -> bytes:
+    # orjson and the stdlib fallback emit the same indent=2 UTF-8 output
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
 
 
 def first_from_srcset(s: str | None) -> str | None:
@@ -55,22 +157,148 @@ def is_placeholder(u: str | None) -> bool:
 
 
 def ext_from(u: str) -> str:
-    ext = Path(urlparse(u).path).suffix.lower()
+    # Suffix of the last path segment, ignoring any ?query or #fragment
+    end = len(u)
+    for sep in "?#":
+        i = u.find(sep, 0, end)
+        if i >= 0:
+            end = i
+    slash = u.rfind("/", 0, end)
+    dot = u.rfind(".", slash + 1, end)
+    ext = u[dot:end].lower() if dot > slash else ""
     return ext if ext in (".svg", ".png", ".jpg", ".jpeg", ".webp") else ".svg"
 
 
-# --- Main ---
-async def main() -> int:
+def extract_img(img) -> str | None:
+    for k in ("data-src",):
+        u = img.get(k)
+        if u and not is_placeholder(u):
+            return u
+    u = first_from_srcset(img.get("data-srcset")) or first_from_srcset(img.get("srcset"))
+    if u and not is_placeholder(u):
+        return u
+    u = img.get("src")
+    if u and not is_placeholder(u):
+        return u
+    return None
+
+
+def build_row(opp_name: str | None, last_img: dict | None, alt_imgs: list[dict]) -> dict:
+    # Images are the attribute dicts EXTRACT_CARDS_JS collects in the browser
+    opp_slug = slugify(opp_name)
+
+    logo_url = None
+    if last_img is not None:
+        # assume last image is opponent (N first)
+        cand = extract_img(last_img)
+        if cand:
+            logo_url = cand
+
+    # Fallback: any image alt loosely matching opponent name (avoid "nebraska")
+    # (the alt's slug holds "nebraska" exactly when the lowercased alt does)
+    if not logo_url and opp_slug:
+        for im in alt_imgs:
+            a = slugify(im.get("alt"))
+            if not a or "nebraska" in a:
+                continue
+            if a in opp_slug or opp_slug in a:
+                cand = extract_img(im)
+                if cand:
+                    logo_url = cand
+                    break
+
+    return {
+        "opponent_name": opp_name,
+        "opponent_slug": opp_slug,
+        "logo_url": logo_url
+    }
+
+
+# --- Downloads ---
+def _validators(headers) -> dict:
+    # Cache validators worth keeping from a logo response (stored in the report)
+    v = {}
+    if headers.get("ETag"):
+        v["etag"] = headers["ETag"]
+    if headers.get("Last-Modified"):
+        v["last_modified"] = headers["Last-Modified"]
+    return v
+
+
+def _conditional_headers(prev: dict) -> dict:
+    h = {}
+    if prev.get("etag"):
+        h["If-None-Match"] = prev["etag"]
+    if prev.get("last_modified"):
+        h["If-Modified-Since"] = prev["last_modified"]
+    return h
+
+
+@contextmanager
+def _replacing(out: Path):
+    # Temp file beside out, swapped in only once the body is complete, so a
+    # failed download never truncates a good logo from an earlier run
+    fd, tmp = tempfile.mkstemp(dir=out.parent, prefix=f".{out.name}.", suffix=".tmp")
     try:
-        from playwright.async_api import async_playwright
-    except ImportError:
-        print("Playwright not installed. Do:\n"
-              "  pip install playwright requests beautifulsoup4 lxml\n"
-              "  python -m playwright install chromium")
-        return 2
-
-    async with async_playwright() as pw:
-        browser = await pw.chromium.launch()
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.chmod(tmp, 0o644)  # mkstemp creates 0600
+        os.replace(tmp, out)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+async def fetch_logo(session, u: str, out: Path, prev: dict) -> tuple[bool, dict]:
+    # Returns (downloaded, validators); a 304 leaves the local file alone
+    async with session.get(u, headers=_conditional_headers(prev),
+                           timeout=aiohttp.ClientTimeout(total=30)) as resp:
+        if resp.status == 304:
+            return False, {**prev, **_validators(resp.headers)}
+        resp.raise_for_status()
+        with _replacing(out) as f:
+            async for chunk in resp.content.iter_chunked(65536):
+                f.write(chunk)
+        return True, _validators(resp.headers)
+
+
+def fetch_logo_sync(u: str, out: Path, prev: dict) -> tuple[bool, dict]:
+    with _SESSION.get(u, headers=_conditional_headers(prev), timeout=30, stream=True) as resp:
+        if resp.status_code == 304:
+            return False, {**prev, **_validators(resp.headers)}
+        resp.raise_for_status()
+        resp.raw.decode_content = True  # undo gzip/deflate like resp.content would
+        with _replacing(out) as f:
+            shutil.copyfileobj(resp.raw, f, length=65536)
+        return True, _validators(resp.headers)
+
+
+async def download_logos(tasks: list[tuple[str, str, Path, dict]]) -> list[tuple[bool, dict] | Exception]:
+    """Fetch (slug, url, out_path, prev_validators) tasks; returns (downloaded, validators) or the error, in task order."""
+    if aiohttp is None:
+        # No aiohttp: sequential, but over one pooled keep-alive session
+        results = []
+        for _, u, out, prev in tasks:
+            try:
+                results.append(fetch_logo_sync(u, out, prev))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    # One keep-alive pool for every logo; up to 8 in flight per host
+    connector = aiohttp.TCPConnector(limit_per_host=8)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        return await asyncio.gather(
+            *(fetch_logo(session, u, out, prev) for _, u, out, prev in tasks),
+            return_exceptions=True,
+        )
+
+
+# --- Main ---
+async def render_schedule(pw_api, keep_html: bool = False) -> tuple[list[dict], bytes | None]:
+    """Render the page; returns the in-browser card extraction (and the DOM snapshot if asked)."""
+    async with pw_api.async_playwright() as pw:
+        browser = await pw.chromium.launch(args=CHROMIUM_ARGS)
         ctx = await browser.new_context(
             user_agent=("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
                         "AppleWebKit/537.36 (KHTML, like Gecko) "
@@ -78,101 +306,102 @@ async def main() -> int:
         )
         page = await ctx.new_page()
 
-        # Load & let lazy stuff happen
+        async def block_heavy(route):
+            if route.request.resource_type in BLOCKED_RESOURCES:
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await page.route("**/*", block_heavy)
+
+        # Load, then scroll to the bottom so lazy-loaded cards render, and wait
+        # until the card count stops changing
         await page.goto(URL, wait_until="networkidle", timeout=60000)
         await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-        await page.wait_for_timeout(1200)
-        await page.evaluate("window.scrollTo(0, 0)")
-        await page.wait_for_timeout(400)
-
-        # Snapshot rendered DOM
-        html = await page.content()
-        (DATA / "schedule_raw_rendered.html").write_text(html, encoding="utf-8")
-        print("Saved: data/schedule_raw_rendered.html")
-
-        soup = BeautifulSoup(html, "lxml")
-        cards = (soup.select("div.schedule-event-item-default")
-                 or soup.select("div.schedule-event-item")
-                 or soup.select("li.schedule__list-item"))
-        print(f"Rendered cards found: {len(cards)}")
-
-        def extract_img(img) -> str | None:
-            for k in ("data-src",):
-                u = img.get(k)
-                if u and not is_placeholder(u):
-                    return u
-            u = first_from_srcset(img.get("data-srcset")) or first_from_srcset(img.get("srcset"))
-            if u and not is_placeholder(u):
-                return u
-            u = img.get("src")
-            if u and not is_placeholder(u):
-                return u
-            return None
-
-        rows = []
-        for card in cards:
-            # Opponent name
-            on = (card.select_one(".schedule-event-item-default__opponent-name")
-                  or card.select_one(".opponent,.team"))
-            opp_name = on.get_text(" ", strip=True) if on else None
-            opp_slug = slugify(opp_name)
-
-            # Images: wrapper usually contains [Nebraska, Opponent] in that order
-            wrap = card.select_one(".schedule-event-item-default__images")
-            imgs = (wrap.find_all("img") if wrap else card.find_all("img"))
-
-            logo_url = None
-            if imgs:
-                # assume last image is opponent (N first)
-                cand = extract_img(imgs[-1])
-                if cand:
-                    logo_url = cand
-
-            # Fallback: any image alt loosely matching opponent name (avoid "nebraska")
-            if not logo_url and opp_name:
-                on_cf = opp_name.casefold()
-                for im in card.select("img[alt]"):
-                    alt = (im.get("alt") or "").lower()
-                    if not alt or "nebraska" in alt:
-                        continue
-                    a = slugify(alt)
-                    if a == opp_slug or (opp_slug and (a in opp_slug or opp_slug in a)):
-                        cand = extract_img(im)
-                        if cand:
-                            logo_url = cand
-                            break
-
-            rows.append({
-                "opponent_name": opp_name,
-                "opponent_slug": opp_slug,
-                "logo_url": logo_url
-            })
-
-        # Write report
-        (DATA / "opponent_logos_found.json").write_text(json.dumps(rows, indent=2), encoding="utf-8")
-        print("Saved: data/opponent_logos_found.json")
-
-        # Try to download logos so the site can use local files immediately
-        saved = 0
-        for r in rows:
-            u, slug = r.get("logo_url"), r.get("opponent_slug")
-            if not (u and slug):
-                print(f"SKIP: {r.get('opponent_name')} → no logo URL")
-                continue
-            try:
-                resp = requests.get(u, timeout=30)
-                resp.raise_for_status()
-                out = OUT_DIR / f"{slug}{ext_from(u)}"
-                out.write_bytes(resp.content)
-                saved += 1
-                print(f"Downloaded {slug} → {out}")
-            except Exception as e:
-                print(f"Download failed for {slug}: {e}")
+        try:
+            await page.wait_for_function(CARDS_SETTLED_JS, arg=CARDS_SETTLE_MS,
+                                         polling=100, timeout=15000)
+        except pw_api.TimeoutError:
+            print("Schedule cards did not settle within 15s; extracting what is there")
 
+        # Read the cards where they are rather than serializing the DOM
+        cards = await page.evaluate(EXTRACT_CARDS_JS)
+        raw = (await page.content()).encode("utf-8") if keep_html else None
         await ctx.close()
         await browser.close()
-        print(f"Done. Logos downloaded: {saved}")
-        return 0
+        return cards, raw
+
+
+async def main() -> int:
+    # DATA is not an ancestor of OUT_DIR, so both need creating
+    for d in (DATA, OUT_DIR):
+        os.makedirs(d, exist_ok=True)
+
+    # Re-use recently extracted cards instead of starting a browser (FORCE_REFRESH=1 to skip)
+    cards_cache = DATA / "schedule_cards_rendered.json"
+    ttl = int(os.environ.get("SCRAPE_HTML_TTL", "900"))
+    if (not os.environ.get("FORCE_REFRESH") and cards_cache.exists()
+            and time.time() - cards_cache.stat().st_mtime < ttl):
+        cards = json.loads(cards_cache.read_bytes())
+        print(f"Using cached data/schedule_cards_rendered.json (younger than {ttl}s)")
+    else:
+        try:
+            import playwright.async_api as pw_api
+        except ImportError:
+            print("Playwright not installed. Do:\n"
+                  "  pip install playwright requests\n"
+                  "  python -m playwright install chromium")
+            return 2
+        cards, raw = await render_schedule(pw_api, keep_html="--debug" in sys.argv[1:])
+        cards_cache.write_bytes(dump_json(cards))
+        if raw is not None:
+            (DATA / "schedule_raw_rendered.html").write_bytes(raw)
+            print("Saved: data/schedule_raw_rendered.html")
+
+    rows = [build_row(c["name"], c["img"], c["alts"]) for c in cards]
+    print(f"Rendered cards found: {len(rows)}")
+
+    # Last run's report carries each logo's ETag/Last-Modified
+    report = DATA / "opponent_logos_found.json"
+    try:
+        seen = {r["opponent_slug"]: r for r in json.loads(report.read_text(encoding="utf-8"))}
+    except (OSError, ValueError, KeyError, TypeError):
+        seen = {}
+
+    # Try to download logos so the site can use local files immediately;
+    # ones already on disk are revalidated with a conditional GET
+    tasks, task_rows = [], []
+    for r in rows:
+        u, slug = r.get("logo_url"), r.get("opponent_slug")
+        if not (u and slug):
+            print(f"SKIP: {r.get('opponent_name')} → no logo URL")
+            continue
+        out = OUT_DIR / f"{slug}{ext_from(u)}"
+        old = seen.get(slug) or {}
+        prev = {k: old[k] for k in ("etag", "last_modified") if old.get(k)} \
+            if out.exists() and old.get("logo_url") == u else {}
+        tasks.append((slug, u, out, prev))
+        task_rows.append(r)
+
+    saved = 0
+    for (slug, _, out, _), r, res in zip(tasks, task_rows, await download_logos(tasks)):
+        if isinstance(res, BaseException):
+            print(f"Download failed for {slug}: {res}")
+            continue
+        downloaded, validators = res
+        r.update(validators)
+        if downloaded:
+            saved += 1
+            print(f"Downloaded {slug} → {out}")
+        else:
+            print(f"Unchanged {slug} → {out}")
+
+    # Write report
+    report.write_bytes(dump_json(rows))
+    print("Saved: data/opponent_logos_found.json")
+
+    print(f"Done. Logos downloaded: {saved}")
+    return 0
 
 
 if __name__ == "__main__":
@@ -1,6 +1,9 @@
 # -*- coding: utf-8 -*-
 import re
+import unicodedata
 from datetime import datetime
+from functools import lru_cache
+from typing import Final
 from zoneinfo import ZoneInfo
 
 TV_MAP = {
@@ -10,22 +13,72 @@ TV_MAP = {
     'abc': 'abc', 'espn': 'espn', 'espn2': 'espn2', 'espnu': 'espnu'
 }
 
-CHICAGO_TZ = ZoneInfo('America/Chicago')
+# Import this rather than calling ZoneInfo() again; bind it to a local in loops
+CHICAGO_TZ: Final = ZoneInfo('America/Chicago')
 
-_slug_re = re.compile(r"[^a-z0-9]+")
+_SLUG_KEEP = frozenset('abcdefghijklmnopqrstuvwxyz0123456789')
 
+class _SlugTable(dict):
+    # str.translate table, filled on demand: keep [a-z0-9] (lowercasing A-Z on
+    # the way), drop combining accents (so NFKD "É" -> "e"), everything else -> "-"
+    def __missing__(self, cp: int):
+        ch = chr(cp)
+        low = ch.lower()
+        if low in _SLUG_KEEP:
+            out = low
+        elif unicodedata.combining(ch):
+            out = None
+        else:
+            out = '-'
+        self[cp] = out
+        return out
+
+_SLUG_TABLE = _SlugTable()
+_dash_re = re.compile(r"-+")
+
+_TV_KEEP = frozenset('abcdefghijklmnopqrstuvwxyz0123456789 ')
+
+class _TvTable(dict):
+    # str.translate table for normalize_tv: delete anything outside [a-z0-9 ]
+    def __missing__(self, cp: int):
+        out = cp if chr(cp) in _TV_KEEP else None
+        self[cp] = out
+        return out
+
+_TV_TABLE = _TvTable()
+
+@lru_cache(maxsize=512)
 def slugify(s: str) -> str:
-    s = s.lower().strip()
-    s = _slug_re.sub('-', s)
-    s = re.sub(r'-+', '-', s).strip('-')
-    return s
+    # Leading/trailing whitespace becomes dashes, which strip('-') removes
+    s = unicodedata.normalize('NFKD', s).translate(_SLUG_TABLE)
+    return _dash_re.sub('-', s).strip('-')
+
+def has_class(name: str) -> str:
+    # XPath predicate equivalent to the CSS ".name" class selector
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+_NO_TEXT_TAGS = frozenset(('script', 'style', 'template'))
+
+def _iter_text(el):
+    # itertext() minus comments and script/style/template bodies (tails kept)
+    if el.text:
+        yield el.text
+    for child in el:
+        if isinstance(child.tag, str) and child.tag not in _NO_TEXT_TAGS:
+            yield from _iter_text(child)
+        if child.tail:
+            yield child.tail
+
+def text_of(el, sep: str = ' ') -> str:
+    # Same joining rules as BeautifulSoup's get_text(sep, strip=True), which
+    # also leaves out comments and script/style/template text
+    return sep.join(t for t in (t.strip() for t in _iter_text(el)) if t)
 
+@lru_cache(maxsize=64)
 def normalize_tv(s: str | None) -> str | None:
     if not s:
         return None
-    key = s.lower().strip()
-    key = re.sub(r"[^a-z0-9 ]+", "", key)
-    return TV_MAP.get(key, None)
+    return TV_MAP.get(s.lower().strip().translate(_TV_TABLE))
 
 def to_chicago_time(dt: datetime) -> datetime:
     # If dt is naive (no tz), assume it's already local; else convert